@@ -1190,48 +1190,62 @@ REMEMBER:
             Number of agents the message was sent to
         """
         logger.info(f"Broadcasting message from agent {sender_agent_id}")
+        sender_short_id = sender_agent_id[:8]
 
         session = self.db_manager.get_session()
         try:
-            # Get all active agents except the sender
-            active_agents = session.query(Agent).filter(
-                Agent.status != "terminated",
-                Agent.id != sender_agent_id
-            ).all()
+            # Get the IDs of all active agents except the sender
+            recipient_ids = [
+                agent_id
+                for (agent_id,) in session.query(Agent.id).filter(
+                    Agent.status != "terminated",
+                    Agent.id != sender_agent_id
+                )
+            ]
 
-            if not active_agents:
+            if not recipient_ids:
                 logger.info(f"No active agents to broadcast to (excluding sender {sender_agent_id})")
                 return 0
 
             # Format message with broadcast prefix
-            formatted_message = f"\n[AGENT {sender_agent_id[:8]} BROADCAST]: {message}\n"
+            formatted_message = f"\n[AGENT {sender_short_id} BROADCAST]: {message}\n"
 
-            # Send to all active agents
-            recipient_count = 0
-            for agent in active_agents:
-                try:
-                    await self.send_message_to_agent(agent.id, formatted_message)
-                    recipient_count += 1
-
-                    # Log the broadcast
-                    log_entry = AgentLog(
-                        agent_id=agent.id,
-                        log_type="agent_communication",
-                        message=f"Received broadcast from agent {sender_agent_id[:8]}",
-                        details={
-                            "sender_id": sender_agent_id,
-                            "recipient_id": agent.id,
-                            "message_type": "broadcast",
-                            "message_content": message[:200],  # Truncate for storage
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                    session.add(log_entry)
-                except Exception as e:
-                    logger.error(f"Failed to send broadcast to agent {agent.id}: {e}")
+            # Send to all active agents concurrently
+            results = await asyncio.gather(
+                *(self.send_message_to_agent(agent_id, formatted_message) for agent_id in recipient_ids),
+                return_exceptions=True,
+            )
 
-            session.commit()
-            logger.info(f"Broadcast from {sender_agent_id[:8]} sent to {recipient_count} agents")
+            # Log the broadcast for every recipient it reached, in one batch.
+            # Everything but the recipient is the same for every row.
+            timestamp = datetime.utcnow().isoformat()
+            log_message = f"Received broadcast from agent {sender_short_id}"
+            message_content = message[:200]  # Truncate for storage
+            log_rows = []
+            for agent_id, result in zip(recipient_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send broadcast to agent {agent_id}: {result}")
+                    continue
+
+                log_rows.append({
+                    "agent_id": agent_id,
+                    "log_type": "agent_communication",
+                    "message": log_message,
+                    "details": {
+                        "sender_id": sender_agent_id,
+                        "recipient_id": agent_id,
+                        "message_type": "broadcast",
+                        "message_content": message_content,
+                        "timestamp": timestamp,
+                    },
+                })
+
+            if log_rows:
+                session.bulk_insert_mappings(AgentLog, log_rows)
+                session.commit()
+
+            recipient_count = len(log_rows)
+            logger.info(f"Broadcast from {sender_short_id} sent to {recipient_count} agents")
             return recipient_count
 
         except Exception as e:
@@ -1252,7 +1266,9 @@ REMEMBER:
         Returns:
             True if message was sent successfully, False otherwise
         """
-        logger.info(f"Sending message from agent {sender_agent_id[:8]} to {recipient_agent_id[:8]}")
+        sender_short_id = sender_agent_id[:8]
+        recipient_short_id = recipient_agent_id[:8]
+        logger.info(f"Sending message from agent {sender_short_id} to {recipient_short_id}")
 
         session = self.db_manager.get_session()
         try:
@@ -1267,7 +1283,7 @@ REMEMBER:
                 return False
 
             # Format message with direct message prefix
-            formatted_message = f"\n[AGENT {sender_agent_id[:8]} TO AGENT {recipient_agent_id[:8]}]: {message}\n"
+            formatted_message = f"\n[AGENT {sender_short_id} TO AGENT {recipient_short_id}]: {message}\n"
 
             # Send the message
             await self.send_message_to_agent(recipient_agent_id, formatted_message)
@@ -1276,7 +1292,7 @@ REMEMBER:
             log_entry = AgentLog(
                 agent_id=recipient_agent_id,
                 log_type="agent_communication",
-                message=f"Received direct message from agent {sender_agent_id[:8]}",
+                message=f"Received direct message from agent {sender_short_id}",
                 details={
                     "sender_id": sender_agent_id,
                     "recipient_id": recipient_agent_id,
@@ -1288,7 +1304,7 @@ REMEMBER:
             session.add(log_entry)
             session.commit()
 
-            logger.info(f"Direct message sent from {sender_agent_id[:8]} to {recipient_agent_id[:8]}")
+            logger.info(f"Direct message sent from {sender_short_id} to {recipient_short_id}")
             return True
 
         except Exception as e:
@@ -2,6 +2,7 @@
 
 import os
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
@@ -999,6 +1000,37 @@ class DatabaseManager:
                     )
                 )
 
+                # Agents table index for active-agent lookups (e.g. broadcasts)
+                conn.execute(
+                    text(
+                        """
+                    CREATE INDEX IF NOT EXISTS idx_agents_status
+                    ON agents(status)
+                """
+                    )
+                )
+
+                # Agent logs index for per-type, per-agent lookups
+                conn.execute(
+                    text(
+                        """
+                    CREATE INDEX IF NOT EXISTS idx_agent_logs_type_agent
+                    ON agent_logs(log_type, agent_id)
+                """
+                    )
+                )
+
+                # Agent communication logs by sender (JSON1 expression index)
+                conn.execute(
+                    text(
+                        """
+                    CREATE INDEX IF NOT EXISTS idx_agent_logs_comm_sender
+                    ON agent_logs(json_extract(details, '$.sender_id'))
+                    WHERE log_type = 'agent_communication'
+                """
+                    )
+                )
+
                 conn.commit()
                 logger.info("Created performance indexes for ticket tracking system")
         except Exception as e:
@@ -1008,6 +1040,19 @@ class DatabaseManager:
         """Get a database session."""
         return self.SessionLocal()
 
+    @contextmanager
+    def session_scope(self, autoflush: bool = True):
+        """Provide a short-lived session that is closed on exit.
+
+        With autoflush=False, queries skip flushing pending changes first.
+        """
+        session = self.SessionLocal()
+        session.autoflush = autoflush
+        try:
+            yield session
+        finally:
+            session.close()
+
     def drop_tables(self):
         """Drop all database tables (for testing)."""
         Base.metadata.drop_all(bind=self.engine)
@@ -1,7 +1,7 @@
 """Abstract interface for LLM providers."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import json
 import logging
 import asyncio
@@ -188,6 +188,10 @@ class OpenAIProvider(LLMProviderInterface):
         self.model = model
         self.embedding_model = embedding_model
 
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its pooled connections."""
+        await self.client.close()
+
     async def enrich_task(
         self,
         task_description: str,
@@ -269,6 +273,20 @@ Ensure the enriched description is actionable and the completion criteria are sp
             # Return zero vector as fallback (3072 for text-embedding-3-large)
             return [0.0] * 3072
 
+    async def generate_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in a single OpenAI request."""
+        try:
+            response = await self.client.embeddings.create(
+                model=self.embedding_model,
+                input=[text[:8000] for text in texts],  # Limit input length
+            )
+            # The API returns one item per input, tagged with its index
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            # Return zero vectors as fallback (3072 for text-embedding-3-large)
+            return [[0.0] * 3072 for _ in texts]
+
     async def analyze_agent_state(
         self,
         agent_output: str,
@@ -7,7 +7,7 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
-from fastapi import FastAPI, HTTPException, Header, WebSocket, WebSocketDisconnect, Body, Request
+from fastapi import FastAPI, HTTPException, Header, WebSocket, WebSocketDisconnect, Body, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse
 from pydantic import BaseModel, Field
@@ -572,6 +572,8 @@ class ServerState:
         self.sse_queues: List[asyncio.Queue] = []
         self.background_queue_processor_task: Optional[asyncio.Task] = None
         self.shutdown_event: asyncio.Event = asyncio.Event()
+        self.task_assignment_events: Dict[str, asyncio.Event] = {}
+        self.task_assignment_waiters: Dict[str, int] = {}
 
     async def initialize(self):
         """Initialize server components."""
@@ -644,6 +646,12 @@ class ServerState:
 
         logger.info("Server state initialized successfully")
 
+    def notify_task_assignment(self, task_id: str):
+        """Wake clients long-polling /task_progress/{task_id}/await_assignment."""
+        event = self.task_assignment_events.pop(task_id, None)
+        if event:
+            event.set()
+
     async def broadcast_update(self, message: Dict[str, Any]):
         """Broadcast update to all connected WebSocket and SSE clients."""
         disconnected = []
@@ -1135,6 +1143,7 @@ async def process_queue():
                 session.commit()
         finally:
             session.close()
+        server_state.notify_task_assignment(next_task.id)
 
         # Broadcast update
         await server_state.broadcast_update({
@@ -1588,6 +1597,10 @@ async def create_task(
                     task.failure_reason = str(e)
                     session.commit()
                 session.close()
+            finally:
+                # Assigned, queued, duplicated or failed - either way waiters
+                # should re-read the task now
+                server_state.notify_task_assignment(task_id)
 
         # Start processing in the background without waiting
         import asyncio
@@ -3611,6 +3624,7 @@ async def bump_task_priority_endpoint(
                 session.commit()
         finally:
             session.close()
+        server_state.notify_task_assignment(task_id)
 
         # Broadcast update
         await server_state.broadcast_update({
@@ -3829,6 +3843,7 @@ async def restart_task_endpoint(
                     session.commit()
             finally:
                 session.close()
+            server_state.notify_task_assignment(task_id)
 
             logger.info(f"Task {task_id} restarted with new agent {agent.id}")
 
@@ -3917,6 +3932,33 @@ async def get_agent_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _get_single_task_progress(session, task_id: str) -> Dict[str, Any]:
+    """Build the /task_progress payload for one task, raising 404 if missing."""
+    task = session.query(Task).filter_by(id=task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    result = {
+        "id": task.id,
+        "status": task.status,
+        "description": task.enriched_description or task.raw_description,
+        "assigned_agent_id": task.assigned_agent_id,
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "phase_id": task.phase_id,
+        "workflow_id": task.workflow_id,
+    }
+
+    # Add phase information if available
+    if task.phase_id:
+        phase = session.query(Phase).filter_by(id=task.phase_id).first()
+        if phase:
+            result["phase_name"] = phase.name
+            result["phase_order"] = phase.order
+
+    return result
+
+
 @app.get("/task_progress")
 async def get_task_progress(
     task_id: Optional[str] = None,
@@ -3927,27 +3969,7 @@ async def get_task_progress(
         session = server_state.db_manager.get_session()
 
         if task_id:
-            task = session.query(Task).filter_by(id=task_id).first()
-            if not task:
-                raise HTTPException(status_code=404, detail="Task not found")
-
-            result = {
-                "id": task.id,
-                "status": task.status,
-                "description": task.enriched_description or task.raw_description,
-                "assigned_agent_id": task.assigned_agent_id,
-                "started_at": task.started_at.isoformat() if task.started_at else None,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                "phase_id": task.phase_id,
-                "workflow_id": task.workflow_id,
-            }
-
-            # Add phase information if available
-            if task.phase_id:
-                phase = session.query(Phase).filter_by(id=task.phase_id).first()
-                if phase:
-                    result["phase_name"] = phase.name
-                    result["phase_order"] = phase.order
+            result = _get_single_task_progress(session, task_id)
         else:
             # Get all active tasks
             tasks = session.query(Task).filter(
@@ -3984,6 +4006,60 @@ async def get_task_progress(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/task_progress/{task_id}/await_assignment")
+async def await_task_assignment(
+    task_id: str,
+    timeout: float = Query(10.0, gt=0, le=30),
+    requesting_agent_id: str = Header(None, alias="X-Agent-ID"),
+):
+    """Long-poll until a pending task is picked up by the background processor.
+
+    Returns the same payload as ``/task_progress?task_id=...`` as soon as the
+    task leaves the initial ``pending`` state (assigned, queued, failed, ...),
+    or its current state once ``timeout`` seconds (at most 30) have elapsed.
+    """
+    try:
+        session = server_state.db_manager.get_session()
+        try:
+            result = _get_single_task_progress(session, task_id)
+        finally:
+            session.close()
+
+        if result["status"] != "pending" or result["assigned_agent_id"]:
+            return result
+
+        # Only requests that actually wait register an event. Nothing awaits
+        # between the read above and this point, so no notification can slip
+        # in between. The waiter count lets the last waiter out remove it.
+        events = server_state.task_assignment_events
+        waiters = server_state.task_assignment_waiters
+        event = events.get(task_id)
+        if event is None:
+            event = events[task_id] = asyncio.Event()
+        waiters[task_id] = waiters.get(task_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters[task_id] -= 1
+            if not waiters[task_id]:
+                del waiters[task_id]
+                events.pop(task_id, None)
+
+        session = server_state.db_manager.get_session()
+        try:
+            return _get_single_task_progress(session, task_id)
+        finally:
+            session.close()
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to await task assignment: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
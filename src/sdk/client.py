@@ -6,6 +6,7 @@ import yaml
 import tempfile
 import shutil
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -25,6 +26,15 @@ from src.sdk.exceptions import (
     QdrantConnectionError,
 )
 
+# Prefer libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml_file(path: Path) -> Any:
+    """Read and parse a single YAML file."""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
 class HephaestusSDK:
     """
@@ -163,6 +173,7 @@ class HephaestusSDK:
         if not yaml_files:
             raise ValueError(f"No phase YAML files found in: {self.phases_dir}")
 
+        phase_files = []
         for yaml_file in yaml_files:
             # Extract phase ID from filename (e.g., "01_planning.yaml" -> 1)
             filename = yaml_file.stem
@@ -176,14 +187,20 @@ class HephaestusSDK:
             except ValueError:
                 continue
 
-            # Load YAML
-            with open(yaml_file, "r") as f:
-                data = yaml.safe_load(f)
+            phase_files.append((phase_id, parts[1], yaml_file))
+
+        if not phase_files:
+            return
+
+        # Read and parse the YAML files concurrently; results keep file order
+        with ThreadPoolExecutor(max_workers=min(8, len(phase_files))) as executor:
+            parsed = list(executor.map(_load_yaml_file, (path for _, _, path in phase_files)))
 
+        for (phase_id, name, _), data in zip(phase_files, parsed):
             # Parse into Phase object
             phase = Phase(
                 id=phase_id,
-                name=parts[1],
+                name=name,
                 description=data.get("description", ""),
                 done_definitions=data.get("Done_Definitions", []),
                 working_directory=data.get("working_directory", "."),
@@ -4,6 +4,15 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
+# (attribute, YAML key) pairs written by Phase.to_yaml_dict, in output order
+_PHASE_REQUIRED_YAML_FIELDS = (
+    ("description", "description"),
+    ("done_definitions", "Done_Definitions"),
+    ("working_directory", "working_directory"),
+)
+# Per-phase CLI settings, written under their own names only when set
+_PHASE_CLI_YAML_FIELDS = ("cli_tool", "cli_model", "glm_api_token_env")
+
 
 @dataclass
 class ValidationCriteria:
@@ -38,21 +47,15 @@ class Phase:
 
     def to_yaml_dict(self) -> Dict[str, Any]:
         """Convert Phase to YAML-compatible dictionary."""
-        # Convert lists to multiline strings for outputs and next_steps
-        outputs_str = "\n".join(f"- {item}" for item in self.outputs) if self.outputs else ""
-        next_steps_str = "\n".join(f"- {item}" for item in self.next_steps) if self.next_steps else ""
+        fields = vars(self)
+        data = {yaml_key: fields[attr] for attr, yaml_key in _PHASE_REQUIRED_YAML_FIELDS}
 
-        data = {
-            "description": self.description,
-            "Done_Definitions": self.done_definitions,
-            "working_directory": self.working_directory,
-        }
-
-        if outputs_str:
-            data["Outputs"] = outputs_str
+        # Convert lists to multiline strings for outputs and next_steps
+        if self.outputs:
+            data["Outputs"] = "\n".join(f"- {item}" for item in self.outputs)
 
-        if next_steps_str:
-            data["Next_Steps"] = next_steps_str
+        if self.next_steps:
+            data["Next_Steps"] = "\n".join(f"- {item}" for item in self.next_steps)
 
         if self.additional_notes:
             data["Additional_Notes"] = self.additional_notes
@@ -64,14 +67,10 @@ class Phase:
             }
 
         # Include CLI configuration if set
-        if self.cli_tool:
-            data["cli_tool"] = self.cli_tool
-
-        if self.cli_model:
-            data["cli_model"] = self.cli_model
-
-        if self.glm_api_token_env:
-            data["glm_api_token_env"] = self.glm_api_token_env
+        for attr in _PHASE_CLI_YAML_FIELDS:
+            value = fields[attr]
+            if value:
+                data[attr] = value
 
         return data
 
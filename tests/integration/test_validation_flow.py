@@ -1,15 +1,16 @@
 """Integration tests for the complete validation flow with inheritance."""
 
 import pytest
-import asyncio
 import uuid
 import json
 import os
 import tempfile
-from unittest.mock import Mock, patch, AsyncMock, MagicMock, call
-from datetime import datetime
+from unittest.mock import AsyncMock, patch
 from pathlib import Path
 
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
 from src.core.database import (
     DatabaseManager,
     Task,
@@ -17,14 +18,37 @@ from src.core.database import (
     Phase,
     Workflow,
     ValidationReview,
-    Base
 )
-from src.mcp.server import app, server_state
-from src.phases.models import PhaseDefinition, WorkflowDefinition
 from src.phases.phase_manager import PhaseManager
-from src.agents.manager import AgentManager
-from src.validation.validator_agent import spawn_validator_agent
-from fastapi.testclient import TestClient
+
+
+def _generate_ids(count):
+    """Generate ``count`` UUID4 hex ids from a single ``os.urandom`` read."""
+    buf = os.urandom(16 * count)
+    return [
+        uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4).hex
+        for i in range(count)
+    ]
+
+
+def _create_test_db_manager(database_path):
+    """Create a DatabaseManager whose SQLite connections skip durability work.
+
+    Test databases are thrown away afterwards, so there is no point paying for
+    an on-disk journal or an fsync on every commit.
+    """
+    db_manager = DatabaseManager(database_path)
+
+    @event.listens_for(db_manager.engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    db_manager.create_tables()
+    return db_manager
 
 
 @pytest.fixture
@@ -33,8 +57,7 @@ def test_db():
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
         db_path = f.name
 
-    db_manager = DatabaseManager(db_path)
-    db_manager.create_tables()
+    db_manager = _create_test_db_manager(db_path)
 
     yield db_manager
 
@@ -42,6 +65,30 @@ def test_db():
     os.unlink(db_path)
 
 
+@pytest.fixture(scope="class")
+def class_db():
+    """Create an in-memory test database shared by every test in a class."""
+    db_manager = _create_test_db_manager(":memory:")
+
+    yield db_manager
+
+    db_manager.engine.dispose()
+
+
+@pytest.fixture
+def db_session(class_db):
+    """Provide a session whose changes are rolled back after each test."""
+    connection = class_db.engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="rollback_only")
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture
 def sample_phase_yaml():
     """Create sample phase YAML files for testing."""
@@ -85,6 +132,10 @@ done_definitions:
         yield temp_dir
 
 
+@patch(
+    "src.validation.validator_agent.spawn_validator_agent",
+    new=AsyncMock(return_value="validator-agent-id"),
+)
 class TestEndToEndValidationFlow:
     """Test the complete validation flow from phase loading to validator execution."""
 
@@ -92,6 +143,8 @@ class TestEndToEndValidationFlow:
     async def test_complete_validation_inheritance_flow(self, test_db, sample_phase_yaml):
         """Test the full flow: load phases -> create task -> inherit validation -> trigger validation."""
 
+        task1_id, task2_id, agent1_id, agent2_id = _generate_ids(4)
+
         # 1. Load phases from YAML
         from src.phases.phase_loader import PhaseLoader
         workflow_def = PhaseLoader.load_phases_from_folder(sample_phase_yaml)
@@ -117,7 +170,7 @@ class TestEndToEndValidationFlow:
 
         # 3. Create task for phase with validation
         task1 = Task(
-            id=str(uuid.uuid4()),
+            id=task1_id,
             raw_description="Implement feature X",
             enriched_description="Implement feature X with tests",
             done_definition="Feature X works and is tested",
@@ -130,7 +183,7 @@ class TestEndToEndValidationFlow:
         # Apply the fix logic (what happens in create_task)
         task1.phase_id = phase1.id
         if task1.phase_id:
-            phase = session.query(Phase).filter_by(id=task1.phase_id).first()
+            phase = session.get(Phase, task1.phase_id)
             if phase and phase.validation:
                 task1.validation_enabled = True
 
@@ -138,7 +191,7 @@ class TestEndToEndValidationFlow:
 
         # 4. Create task for phase without validation
         task2 = Task(
-            id=str(uuid.uuid4()),
+            id=task2_id,
             raw_description="Write documentation",
             enriched_description="Write comprehensive documentation",
             done_definition="Documentation is complete",
@@ -150,7 +203,7 @@ class TestEndToEndValidationFlow:
 
         task2.phase_id = phase2.id
         if task2.phase_id:
-            phase = session.query(Phase).filter_by(id=task2.phase_id).first()
+            phase = session.get(Phase, task2.phase_id)
             if phase and phase.validation:
                 task2.validation_enabled = True
 
@@ -162,7 +215,7 @@ class TestEndToEndValidationFlow:
 
         # 6. Simulate agent completing task1 (with validation)
         agent1 = Agent(
-            id=str(uuid.uuid4()),
+            id=agent1_id,
             name="Agent 1",
             status="active",
             current_task_id=task1.id,
@@ -174,21 +227,29 @@ class TestEndToEndValidationFlow:
         session.commit()
 
         # When agent marks task as done, validation should trigger
-        with patch('src.validation.validator_agent.spawn_validator_agent') as mock_spawn:
-            mock_spawn.return_value = "validator-agent-id"
-
-            # Simulate the logic in update_task_status
-            if task1.validation_enabled:
-                task1.status = "under_review"
-                task1.validation_iteration = 1
-                session.commit()
-
-                # Validator should be spawned (in real flow)
-                # validator_id = await spawn_validator_agent(...)
-
-                task1.status = "validation_in_progress"
-                agent1.kept_alive_for_validation = True
-                session.commit()
+        # (spawn_validator_agent is mocked for the whole class)
+        if task1.validation_enabled:
+            session.execute(
+                update(Task)
+                .where(Task.id == task1.id)
+                .values(status="under_review", validation_iteration=1)
+            )
+            session.commit()
+
+            # Validator should be spawned (in real flow)
+            # validator_id = await spawn_validator_agent(...)
+
+            session.execute(
+                update(Task)
+                .where(Task.id == task1.id)
+                .values(status="validation_in_progress")
+            )
+            session.execute(
+                update(Agent)
+                .where(Agent.id == agent1.id)
+                .values(kept_alive_for_validation=True)
+            )
+            session.commit()
 
         # Verify validation was triggered
         assert task1.status == "validation_in_progress"
@@ -197,7 +258,7 @@ class TestEndToEndValidationFlow:
 
         # 7. Simulate agent completing task2 (without validation)
         agent2 = Agent(
-            id=str(uuid.uuid4()),
+            id=agent2_id,
             name="Agent 2",
             status="active",
             current_task_id=task2.id,
@@ -220,7 +281,7 @@ class TestEndToEndValidationFlow:
         # Verify no validation triggered
         assert task2.status == "done"
         assert task2.validation_iteration == 0
-        assert not hasattr(agent2, 'kept_alive_for_validation') or not agent2.kept_alive_for_validation
+        assert not agent2.kept_alive_for_validation
 
         session.close()
 
@@ -228,11 +289,13 @@ class TestEndToEndValidationFlow:
     async def test_validation_feedback_loop(self, test_db):
         """Test that validation feedback loop works with inherited validation."""
 
+        workflow_id, phase_id, task_id, review1_id, review2_id = _generate_ids(5)
+
         session = test_db.get_session()
 
         # Setup
         workflow = Workflow(
-            id=str(uuid.uuid4()),
+            id=workflow_id,
             name="Test Workflow",
             phases_folder_path="/test/path",
             status="active"
@@ -240,7 +303,7 @@ class TestEndToEndValidationFlow:
         session.add(workflow)
 
         phase = Phase(
-            id=str(uuid.uuid4()),
+            id=phase_id,
             workflow_id=workflow.id,
             order=1,
             name="Validated Phase",
@@ -255,7 +318,7 @@ class TestEndToEndValidationFlow:
         session.add(phase)
 
         task = Task(
-            id=str(uuid.uuid4()),
+            id=task_id,
             raw_description="Implement feature",
             enriched_description="Implement feature with tests",
             done_definition="Feature works",
@@ -278,24 +341,33 @@ class TestEndToEndValidationFlow:
         session.commit()
 
         # First validation attempt - FAIL
-        task.status = "under_review"
-        task.validation_iteration = 1
+        session.execute(
+            update(Task)
+            .where(Task.id == task.id)
+            .values(status="under_review", validation_iteration=1)
+        )
         session.commit()
 
         # Validator provides feedback
-        validation_review1 = ValidationReview(
-            id=str(uuid.uuid4()),
-            task_id=task.id,
-            validator_agent_id="validator-1",
-            iteration_number=1,
-            validation_passed=False,
-            feedback="Tests are failing. Please fix the implementation.",
-            evidence=json.dumps(["pytest output shows 3 failures"])
+        review1_data = {
+            "id": review1_id,
+            "task_id": task.id,
+            "validator_agent_id": "validator-1",
+            "iteration_number": 1,
+            "validation_passed": False,
+            "feedback": "Tests are failing. Please fix the implementation.",
+            "evidence": json.dumps(["pytest output shows 3 failures"]),
+        }
+        session.bulk_insert_mappings(ValidationReview, [review1_data])
+
+        session.execute(
+            update(Task)
+            .where(Task.id == task.id)
+            .values(
+                status="needs_work",
+                last_validation_feedback=review1_data["feedback"],
+            )
         )
-        session.add(validation_review1)
-
-        task.status = "needs_work"
-        task.last_validation_feedback = validation_review1.feedback
         session.commit()
 
         # Agent is still alive and can work on feedback
@@ -303,25 +375,33 @@ class TestEndToEndValidationFlow:
         assert task.status == "needs_work"
 
         # Second validation attempt - PASS
-        task.status = "under_review"
-        task.validation_iteration = 2
+        session.execute(
+            update(Task)
+            .where(Task.id == task.id)
+            .values(status="under_review", validation_iteration=2)
+        )
         session.commit()
 
-        validation_review2 = ValidationReview(
-            id=str(uuid.uuid4()),
-            task_id=task.id,
-            validator_agent_id="validator-2",
-            iteration_number=2,
-            validation_passed=True,
-            feedback="All tests passing. Implementation looks good.",
-            evidence=json.dumps(["All 10 tests passed"]),
-            recommendations=json.dumps(["Consider adding performance tests"])
+        review2_data = {
+            "id": review2_id,
+            "task_id": task.id,
+            "validator_agent_id": "validator-2",
+            "iteration_number": 2,
+            "validation_passed": True,
+            "feedback": "All tests passing. Implementation looks good.",
+            "evidence": json.dumps(["All 10 tests passed"]),
+            "recommendations": json.dumps(["Consider adding performance tests"]),
+        }
+        session.bulk_insert_mappings(ValidationReview, [review2_data])
+
+        session.execute(
+            update(Task)
+            .where(Task.id == task.id)
+            .values(status="done", review_done=True)
+        )
+        session.execute(
+            update(Agent).where(Agent.id == agent.id).values(status="completed")
         )
-        session.add(validation_review2)
-
-        task.status = "done"
-        task.review_done = True
-        agent.status = "completed"
         session.commit()
 
         # Verify complete flow
@@ -342,10 +422,12 @@ class TestEndToEndValidationFlow:
     async def test_validation_with_explicit_disable(self, test_db):
         """Test that validation can be explicitly disabled even when present in YAML."""
 
+        workflow_id, phase_id, task_id = _generate_ids(3)
+
         session = test_db.get_session()
 
         workflow = Workflow(
-            id=str(uuid.uuid4()),
+            id=workflow_id,
             name="Test Workflow",
             phases_folder_path="/test/path",
             status="active"
@@ -354,7 +436,7 @@ class TestEndToEndValidationFlow:
 
         # Phase with validation but explicitly disabled
         phase = Phase(
-            id=str(uuid.uuid4()),
+            id=phase_id,
             workflow_id=workflow.id,
             order=1,
             name="Disabled Validation Phase",
@@ -372,7 +454,7 @@ class TestEndToEndValidationFlow:
 
         # Create task
         task = Task(
-            id=str(uuid.uuid4()),
+            id=task_id,
             raw_description="Task",
             enriched_description="Task enriched",
             done_definition="Done",
@@ -383,7 +465,7 @@ class TestEndToEndValidationFlow:
 
         # Apply inheritance logic (need to update to handle explicit disable)
         if task.phase_id:
-            phase_obj = session.query(Phase).filter_by(id=task.phase_id).first()
+            phase_obj = session.get(Phase, task.phase_id)
             if phase_obj and phase_obj.validation:
                 # Check for explicit disable
                 if phase_obj.validation.get("enabled", True):
@@ -401,17 +483,20 @@ class TestEndToEndValidationFlow:
         session.close()
 
 
+@pytest.mark.usefixtures("class_db")
 class TestValidationErrorHandling:
     """Test error handling in validation inheritance."""
 
-    def test_task_creation_without_phase(self, test_db):
+    def test_task_creation_without_phase(self, db_session):
         """Test that tasks without phases don't break validation logic."""
 
-        session = test_db.get_session()
+        (task_id,) = _generate_ids(1)
+
+        session = db_session
 
         # Create task without phase
         task = Task(
-            id=str(uuid.uuid4()),
+            id=task_id,
             raw_description="Standalone task",
             enriched_description="Standalone task enriched",
             done_definition="Done when complete",
@@ -422,7 +507,7 @@ class TestValidationErrorHandling:
 
         # Apply inheritance logic
         if task.phase_id:
-            phase = session.query(Phase).filter_by(id=task.phase_id).first()
+            phase = session.get(Phase, task.phase_id)
             if phase and phase.validation:
                 task.validation_enabled = True
 
@@ -432,15 +517,15 @@ class TestValidationErrorHandling:
         assert task.validation_enabled == False
         assert task.phase_id is None
 
-        session.close()
-
-    def test_task_with_invalid_phase_id(self, test_db):
+    def test_task_with_invalid_phase_id(self, db_session):
         """Test handling of invalid phase IDs."""
 
-        session = test_db.get_session()
+        (task_id,) = _generate_ids(1)
+
+        session = db_session
 
         task = Task(
-            id=str(uuid.uuid4()),
+            id=task_id,
             raw_description="Task with bad phase",
             enriched_description="Task enriched",
             done_definition="Done",
@@ -451,7 +536,7 @@ class TestValidationErrorHandling:
 
         # Apply inheritance logic - should handle gracefully
         if task.phase_id:
-            phase = session.query(Phase).filter_by(id=task.phase_id).first()
+            phase = session.get(Phase, task.phase_id)
             if phase and phase.validation:  # phase will be None
                 task.validation_enabled = True
 
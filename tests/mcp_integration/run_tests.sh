@@ -34,9 +34,9 @@ echo ""
 echo -e "${YELLOW}Running MCP integration tests...${NC}"
 echo ""
 
-# Run the test script
+# Run the test script (the health check above already passed)
 cd /Users/idol/projects/hephaestus
-python tests/mcp_integration/test_mcp_flow.py
+python tests/mcp_integration/test_mcp_flow.py --health-known-ok
 
 echo ""
 echo -e "${GREEN}Test execution complete!${NC}"
\ No newline at end of file
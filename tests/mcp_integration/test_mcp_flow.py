@@ -7,9 +7,13 @@ Tests the full flow of Hephaestus MCP integration without running Claude Code
 import asyncio
 import httpx
 import json
+import orjson
+import os
+import random
+import tempfile
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import sys
 from pathlib import Path
 
@@ -21,37 +25,174 @@ BLUE = '\033[94m'
 RESET = '\033[0m'
 BOLD = '\033[1m'
 
+# Pre-rendered status markers
+PASS_MARK = f"{GREEN}✓{RESET}"
+FAIL_MARK = f"{RED}✗{RESET}"
+PASS_LABEL = f"{GREEN}PASS{RESET}"
+FAIL_LABEL = f"{RED}FAIL{RESET}"
+
+# Make the repository root importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from tests.task_progress_wait import wait_for_task_assignment
+
 # Server configuration
 HEPHAESTUS_URL = "http://localhost:8000"
 
 
+def _new_client() -> httpx.AsyncClient:
+    """Create the keep-alive client a test run shares across its concurrent tests"""
+    return httpx.AsyncClient(
+        base_url=HEPHAESTUS_URL,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=10.0,
+    )
+
+
+# Fast decoder for the task listing responses
+_loads = orjson.loads
+
+# Static create_task request body, JSON-encoded once at import
+CREATE_TASK_BODY = orjson.dumps({
+    "task_description": "Test task: Create a hello world script",
+    "done_definition": "Script created and prints 'Hello, World!'",
+    "ai_agent_id": "test-agent-001",
+    "priority": "medium"
+})
+
+# Result payloads reported by the report_results tests, encoded once at import
+MARKDOWN_RESULT_1 = """# Task Results: Create Hello World Script
+
+## Summary
+Successfully created a Python script that prints "Hello, World!" to the console.
+
+## Detailed Achievements
+- Created hello_world.py with proper Python syntax
+- Tested script execution
+- Verified output matches requirements
+
+## Artifacts Created
+| File Path | Type | Description |
+|-----------|------|-------------|
+| hello_world.py | Python Script | Main script file |
+
+## Validation Evidence
+```bash
+$ python hello_world.py
+Hello, World!
+```
+
+## Known Limitations
+None identified.
+
+## Recommended Next Steps
+- Consider adding command-line argument support
+- Add unit tests for the script
+"""
+MARKDOWN_RESULT_1_BYTES = MARKDOWN_RESULT_1.encode("utf-8")
+
+MARKDOWN_RESULT_2 = """# Additional Results: Code Optimization
+
+## Summary
+Optimized the hello world script for better performance.
+
+## Improvements Made
+- Added proper shebang line
+- Added main function guard
+"""
+MARKDOWN_RESULT_2_BYTES = MARKDOWN_RESULT_2.encode("utf-8")
+
+
+def _write_temp_markdown(content: bytes) -> str:
+    """Write encoded markdown to a temporary file and return its path"""
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.md', delete=False) as f:
+        f.write(content)
+        return f.name
+
+
+def _error_detail(response: httpx.Response) -> Any:
+    """Return the 'detail' of a JSON error body, or the raw text for non-JSON bodies"""
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        if isinstance(body, dict):
+            return body.get("detail", response.text)
+    return response.text
+
+
+async def _with_retry(coro_factory, *, retries: int = 3):
+    """Await coro_factory(), retrying failed connection attempts with jittered backoff
+
+    Only ConnectError is retried: the request never reached the server, so
+    retrying a POST cannot create a duplicate task or result. HTTP error
+    statuses are returned to the caller as-is and never retried.
+    """
+    delay = 0.5
+    for attempt in range(retries):
+        try:
+            return await coro_factory()
+        except httpx.ConnectError:
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(delay * (0.5 + random.random() * 0.5))
+            delay = min(delay * 2, 5.0)
+
+
 class MCPIntegrationTester:
     """Test the MCP integration flow"""
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=10.0)
-        self.test_results = []
+    def __init__(self, client: httpx.AsyncClient, health_known_ok: bool = False):
+        # Owned by the caller, which closes it once all testers are done
+        self.client = client
+        # Set when the caller already got a 200 from /health (e.g. the test
+        # runner's prerequisite check), so the health test needn't re-probe it
+        self.health_known_ok = health_known_ok
+        # Test results, kept as parallel lists (one entry per log_test call)
+        self._names: List[str] = []
+        self._success: List[bool] = []
+        self._messages: List[str] = []
         self.created_task_id = None
         self.assigned_agent_id = None
+        # Resolved by test_create_task so dependent tests can start as soon as
+        # the task exists / has an agent, instead of being sequenced after it
+        self.task_ready = asyncio.Event()
+        self.agent_ready = asyncio.Event()
+        self._ready_agent_id: Optional[str] = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared client, retrying transient connection errors"""
+        return await _with_retry(lambda: self.client.request(method, url, **kwargs))
+
+    async def _fetch(self, path: str, params: Dict[str, str], timeout: float):
+        """GET adapter for wait_for_task_assignment: (status, content type, body)"""
+        response = await self._request(
+            "GET", path, params=params, headers={"X-Agent-ID": "test-agent-001"}, timeout=timeout
+        )
+        return response.status_code, response.headers.get("content-type", ""), response.content
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # The client belongs to the caller (see main()), which closes it
+        pass
 
     def log_test(self, test_name: str, success: bool, message: str = ""):
         """Log test result"""
-        status = f"{GREEN}✓{RESET}" if success else f"{RED}✗{RESET}"
+        status = PASS_MARK if success else FAIL_MARK
         print(f"{status} {test_name}")
         if message:
             print(f"  {YELLOW}→{RESET} {message}")
-        self.test_results.append({"test": test_name, "success": success, "message": message})
+        self._names.append(test_name)
+        self._success.append(success)
+        self._messages.append(message)
 
     async def test_server_health(self) -> bool:
         """Test 1: Check if server is healthy"""
+        if self.health_known_ok:
+            self.log_test("Server Health Check", True, "cached from prereq check")
+            return True
         try:
-            response = await self.client.get(f"{HEPHAESTUS_URL}/health")
+            response = await self._request("GET", "/health")
             success = response.status_code == 200
             self.log_test("Server Health Check", success, f"Status: {response.status_code}")
             return success
@@ -63,16 +204,10 @@ class MCPIntegrationTester:
         """Test 2: Create a task via MCP endpoint"""
         try:
             # This simulates what the MCP tool would send
-            payload = {
-                "task_description": "Test task: Create a hello world script",
-                "done_definition": "Script created and prints 'Hello, World!'",
-                "ai_agent_id": "test-agent-001",
-                "priority": "medium"
-            }
-
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/create_task",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/create_task",
+                content=CREATE_TASK_BODY,
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": "test-agent-001"
@@ -84,32 +219,15 @@ class MCPIntegrationTester:
                 data = response.json()
                 self.created_task_id = data.get("task_id")
                 self.assigned_agent_id = data.get("assigned_agent_id")
+                self.task_ready.set()
 
-                # Wait for async task assignment to complete
-                max_retries = 10
-                retry_delay = 2
-
-                for retry in range(max_retries):
-                    await asyncio.sleep(retry_delay)
-
-                    # Query the specific task to get the assigned agent
-                    task_query_response = await self.client.get(
-                        f"{HEPHAESTUS_URL}/task_progress",
-                        headers={"X-Agent-ID": "test-agent-001"}
-                    )
-
-                    if task_query_response.status_code == 200:
-                        tasks = task_query_response.json()
-                        # Find our specific task
-                        for task in (tasks if isinstance(tasks, list) else [tasks]):
-                            if task.get("id") == self.created_task_id:
-                                agent_id = task.get("assigned_agent_id")
-                                if agent_id and agent_id != "pending":
-                                    self.assigned_agent_id = agent_id
-                                    break
-
-                        if self.assigned_agent_id and self.assigned_agent_id != "pending":
-                            break
+                # Wait for async task assignment
+                task = await wait_for_task_assignment(
+                    self._fetch, self.created_task_id, timeout=10
+                )
+                agent_id = task.get("assigned_agent_id") if task else None
+                if agent_id and agent_id != "pending":
+                    self.assigned_agent_id = agent_id
 
                 self.log_test(
                     "Create Task via MCP",
@@ -122,18 +240,35 @@ class MCPIntegrationTester:
         except Exception as e:
             self.log_test("Create Task via MCP", False, f"Error: {e}")
             return False
+        finally:
+            self._resolve_task_context()
+
+    def _resolve_task_context(self):
+        """Release the tests waiting on test_create_task, whatever its outcome"""
+        self.task_ready.set()
+        if not self.agent_ready.is_set():
+            agent_id = self.assigned_agent_id
+            self._ready_agent_id = agent_id if agent_id and agent_id != "pending" else None
+            self.agent_ready.set()
+
+    async def _wait_for_agent(self, timeout: float = 15) -> Optional[str]:
+        """Wait for test_create_task to observe the agent assigned to the task"""
+        try:
+            await asyncio.wait_for(self.agent_ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._ready_agent_id
 
     async def test_get_tasks(self) -> bool:
         """Test 3: Get tasks list"""
         try:
-            response = await self.client.get(
-                f"{HEPHAESTUS_URL}/task_progress",
-                headers={"X-Agent-ID": "test-agent-001"}
+            response = await self._request(
+                "GET", "/task_progress", headers={"X-Agent-ID": "test-agent-001"}
             )
 
             success = response.status_code == 200
             if success:
-                tasks = response.json()
+                tasks = _loads(response.content)
                 task_count = len(tasks) if isinstance(tasks, list) else 1
                 self.log_test("Get Tasks List", success, f"Found {task_count} task(s)")
             else:
@@ -145,6 +280,7 @@ class MCPIntegrationTester:
 
     async def test_save_memory(self) -> bool:
         """Test 4: Save memory via MCP"""
+        await self._wait_for_agent()
         try:
             payload = {
                 "ai_agent_id": self.assigned_agent_id or "test-agent-001",
@@ -154,9 +290,10 @@ class MCPIntegrationTester:
                 "related_files": []
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/save_memory",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/save_memory",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": self.assigned_agent_id or "test-agent-001"
@@ -177,6 +314,7 @@ class MCPIntegrationTester:
 
     async def test_update_task_wrong_agent(self) -> bool:
         """Test 5: Try to update task with wrong agent ID (should fail)"""
+        await self.task_ready.wait()
         if not self.created_task_id:
             self.log_test("Update Task (Wrong Agent)", False, "No task created to test")
             return False
@@ -190,9 +328,10 @@ class MCPIntegrationTester:
                 "key_learnings": ["Testing authorization"]
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/update_task_status",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/update_task_status",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": "wrong-agent-id"
@@ -205,7 +344,7 @@ class MCPIntegrationTester:
                 self.log_test(
                     "Update Task (Wrong Agent)",
                     success,
-                    f"Correctly rejected with: {response.json().get('detail', response.text)}"
+                    f"Correctly rejected with: {_error_detail(response)}"
                 )
             else:
                 self.log_test("Update Task (Wrong Agent)", False, "Should have been rejected but wasn't")
@@ -216,6 +355,7 @@ class MCPIntegrationTester:
 
     async def test_report_results(self) -> bool:
         """Test 6: Report results for a task"""
+        await self._wait_for_agent()
         if not self.created_task_id:
             self.log_test("Report Results", False, "No task to test")
             return False
@@ -226,44 +366,8 @@ class MCPIntegrationTester:
             return False
 
         try:
-            # Create a temporary markdown file
-            import tempfile
-            import os
-
-            # Create markdown content
-            markdown_content = """# Task Results: Create Hello World Script
-
-## Summary
-Successfully created a Python script that prints "Hello, World!" to the console.
-
-## Detailed Achievements
-- Created hello_world.py with proper Python syntax
-- Tested script execution
-- Verified output matches requirements
-
-## Artifacts Created
-| File Path | Type | Description |
-|-----------|------|-------------|
-| hello_world.py | Python Script | Main script file |
-
-## Validation Evidence
-```bash
-$ python hello_world.py
-Hello, World!
-```
-
-## Known Limitations
-None identified.
-
-## Recommended Next Steps
-- Consider adding command-line argument support
-- Add unit tests for the script
-"""
-
-            # Write to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-                f.write(markdown_content)
-                result_file_path = f.name
+            # Write to temporary file (off the event loop)
+            result_file_path = await asyncio.to_thread(_write_temp_markdown, MARKDOWN_RESULT_1_BYTES)
 
             # Report results
             payload = {
@@ -273,9 +377,10 @@ None identified.
                 "summary": "Created hello world script with proper output"
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/report_results",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/report_results",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": self.assigned_agent_id
@@ -283,7 +388,7 @@ None identified.
             )
 
             # Clean up temp file
-            os.unlink(result_file_path)
+            await asyncio.to_thread(os.unlink, result_file_path)
 
             success = response.status_code == 200
             if success:
@@ -294,7 +399,7 @@ None identified.
                 self.log_test(
                     "Report Results",
                     success,
-                    f"Failed: {response.json().get('detail', response.text)}"
+                    f"Failed: {_error_detail(response)}"
                 )
             return success
         except Exception as e:
@@ -303,6 +408,7 @@ None identified.
 
     async def test_report_multiple_results(self) -> bool:
         """Test 7: Report multiple results for the same task"""
+        await self._wait_for_agent()
         if not self.created_task_id:
             self.log_test("Report Multiple Results", False, "No task to test")
             return False
@@ -313,24 +419,8 @@ None identified.
             return False
 
         try:
-            import tempfile
-            import os
-
-            # Create second result markdown
-            markdown_content = """# Additional Results: Code Optimization
-
-## Summary
-Optimized the hello world script for better performance.
-
-## Improvements Made
-- Added proper shebang line
-- Added main function guard
-"""
-
-            # Write to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-                f.write(markdown_content)
-                result_file_path = f.name
+            # Write to temporary file (off the event loop)
+            result_file_path = await asyncio.to_thread(_write_temp_markdown, MARKDOWN_RESULT_2_BYTES)
 
             # Report second result
             payload = {
@@ -340,9 +430,10 @@ Optimized the hello world script for better performance.
                 "summary": "Optimized hello world script"
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/report_results",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/report_results",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": self.assigned_agent_id
@@ -350,7 +441,7 @@ Optimized the hello world script for better performance.
             )
 
             # Clean up temp file
-            os.unlink(result_file_path)
+            await asyncio.to_thread(os.unlink, result_file_path)
 
             success = response.status_code == 200
             if success:
@@ -361,7 +452,7 @@ Optimized the hello world script for better performance.
                 self.log_test(
                     "Report Multiple Results",
                     success,
-                    f"Failed: {response.json().get('detail', response.text)}"
+                    f"Failed: {_error_detail(response)}"
                 )
             return success
         except Exception as e:
@@ -370,6 +461,7 @@ Optimized the hello world script for better performance.
 
     async def test_update_task_correct_agent(self) -> bool:
         """Test 8: Update task with correct agent ID (should succeed)"""
+        await self._wait_for_agent()
         if not self.created_task_id:
             self.log_test("Update Task (Correct Agent)", False, "No task to test")
             return False
@@ -391,9 +483,10 @@ Optimized the hello world script for better performance.
                 ]
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/update_task_status",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/update_task_status",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": self.assigned_agent_id
@@ -407,7 +500,7 @@ Optimized the hello world script for better performance.
                 self.log_test(
                     "Update Task (Correct Agent)",
                     success,
-                    f"Failed: {response.json().get('detail', response.text)}"
+                    f"Failed: {_error_detail(response)}"
                 )
             return success
         except Exception as e:
@@ -417,6 +510,7 @@ Optimized the hello world script for better performance.
     async def test_update_missing_fields(self) -> bool:
         """Test 9: Update task with missing required fields (should fail)"""
         # This test requires an existing task with agent
+        await self._wait_for_agent()
         if not self.created_task_id or not self.assigned_agent_id or self.assigned_agent_id == "pending":
             self.log_test("Update Task (Missing Fields)", False, "Requires existing task with assigned agent")
             return False
@@ -431,9 +525,10 @@ Optimized the hello world script for better performance.
                 # key_learnings is missing!
             }
 
-            response = await self.client.post(
-                f"{HEPHAESTUS_URL}/update_task_status",
-                json=payload,
+            response = await self._request(
+                "POST",
+                "/update_task_status",
+                content=orjson.dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "X-Agent-ID": self.assigned_agent_id
@@ -467,8 +562,9 @@ Optimized the hello world script for better performance.
     async def test_agent_status(self) -> bool:
         """Test 10: Get agent status"""
         try:
-            response = await self.client.get(
-                f"{HEPHAESTUS_URL}/agent_status",
+            response = await self._request(
+                "GET",
+                "/agent_status",
                 headers={"X-Agent-ID": "test-agent-001"}
             )
 
@@ -485,7 +581,7 @@ Optimized the hello world script for better performance.
             return False
 
     async def run_all_tests(self):
-        """Run all tests in sequence"""
+        """Run all tests, concurrently where they are independent"""
         print(f"\n{BOLD}{BLUE}=== MCP Integration Tests ==={RESET}\n")
         print(f"Testing against: {HEPHAESTUS_URL}\n")
 
@@ -493,26 +589,38 @@ Optimized the hello world script for better performance.
         if not await self.test_server_health():
             print(f"\n{RED}ERROR: Server is not running at {HEPHAESTUS_URL}{RESET}")
             print(f"Please start the server with: {YELLOW}python run_server.py{RESET}\n")
-            return
+            return False
 
         print(f"\n{BOLD}Running MCP Flow Tests:{RESET}\n")
 
-        # Run tests in order
-        await self.test_create_task()
-        await self.test_get_tasks()
-        await self.test_save_memory()
-        await self.test_update_task_wrong_agent()
-        await self.test_report_results()  # New test for reporting results
-        await self.test_report_multiple_results()  # New test for multiple results
+        # Tests run concurrently; the ones that need the created task or its
+        # agent wait on task_ready / agent_ready rather than on a whole stage
+        concurrent_tests = [
+            ("Create Task via MCP", self.test_create_task()),
+            ("Get Tasks List", self.test_get_tasks()),
+            ("Get Agent Status", self.test_agent_status()),
+            ("Save Memory", self.test_save_memory()),
+            ("Update Task (Wrong Agent)", self.test_update_task_wrong_agent()),
+            ("Report Results", self.test_report_results()),
+            ("Report Multiple Results", self.test_report_multiple_results()),
+        ]
+        outcomes = await asyncio.gather(
+            *(coro for _, coro in concurrent_tests), return_exceptions=True
+        )
+        # A test that raised instead of logging its own result still counts as a failure
+        for (name, _), outcome in zip(concurrent_tests, outcomes):
+            if isinstance(outcome, BaseException):
+                self.log_test(name, False, f"Error: {outcome}")
+
+        # These change the task status, so they run last and in order
         await self.test_update_task_correct_agent()
         await self.test_update_missing_fields()
-        await self.test_agent_status()
 
         # Print summary
         print(f"\n{BOLD}{BLUE}=== Test Summary ==={RESET}\n")
 
-        passed = sum(1 for r in self.test_results if r["success"])
-        failed = len(self.test_results) - passed
+        passed = sum(self._success)
+        failed = len(self._success) - passed
 
         if failed == 0:
             print(f"{GREEN}{BOLD}All {passed} tests passed!{RESET}")
@@ -520,22 +628,35 @@ Optimized the hello world script for better performance.
             print(f"{GREEN}Passed: {passed}{RESET} | {RED}Failed: {failed}{RESET}")
 
         print("\nDetailed Results:")
-        for result in self.test_results:
-            status = f"{GREEN}PASS{RESET}" if result["success"] else f"{RED}FAIL{RESET}"
-            print(f"  [{status}] {result['test']}")
-            if not result["success"] and result["message"]:
-                print(f"        {result['message']}")
+        for name, success, message in zip(self._names, self._success, self._messages):
+            status = PASS_LABEL if success else FAIL_LABEL
+            print(f"  [{status}] {name}")
+            if not success and message:
+                print(f"        {message}")
 
+        return failed == 0
 
-async def main():
+
+async def main(health_known_ok: bool = False) -> bool:
     """Main entry point"""
-    async with MCPIntegrationTester() as tester:
-        await tester.run_all_tests()
+    async with _new_client() as client:
+        async with MCPIntegrationTester(client, health_known_ok=health_known_ok) as tester:
+            return await tester.run_all_tests()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Hephaestus MCP integration flow tests")
+    parser.add_argument(
+        "--health-known-ok",
+        action="store_true",
+        help="Skip the /health probe; the caller has already checked the server",
+    )
+    args = parser.parse_args()
+
     try:
-        asyncio.run(main())
+        asyncio.run(main(health_known_ok=args.health_known_ok))
     except KeyboardInterrupt:
         print(f"\n{YELLOW}Tests interrupted by user{RESET}")
     except Exception as e:
@@ -6,11 +6,34 @@ import sys
 import os
 import time
 from datetime import datetime
-import subprocess
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Created lazily by get_http_client() and shared by all prerequisite probes
+_http_client = None
+
+
+def get_http_client():
+    """Return the shared keep-alive HTTP client used by the test runner."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=2.0,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 def print_header(title):
     """Print a formatted header."""
@@ -26,36 +49,43 @@ def print_section(title):
     print("-" * 60)
 
 
+async def _probe(url, timeout):
+    """GET a service URL, returning (responded with 200, exception raised or None)."""
+    try:
+        response = await get_http_client().get(url, timeout=timeout)
+        return response.status_code == 200, None
+    except Exception as e:
+        return False, e
+
+
 async def check_prerequisites():
     """Check that all required services are running."""
     print_section("Checking Prerequisites")
 
     issues = []
 
+    # Probe Qdrant and the MCP server concurrently
+    (qdrant_ok, qdrant_error), (mcp_ok, mcp_error) = await asyncio.gather(
+        _probe("http://localhost:6333/collections", timeout=2),
+        _probe("http://localhost:8000/health", timeout=2),
+    )
+
     # Check Qdrant
     print("\n📍 Checking Qdrant...")
-    try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:6333/collections")
-            if response.status_code == 200:
-                print("   ✅ Qdrant is running on port 6333")
-            else:
-                issues.append("Qdrant is not responding properly")
-    except Exception as e:
+    if qdrant_ok:
+        print("   ✅ Qdrant is running on port 6333")
+    elif qdrant_error is None:
+        issues.append("Qdrant is not responding properly")
+    else:
         issues.append("Qdrant is not running. Start it with: docker run -p 6333:6333 qdrant/qdrant")
 
     # Check MCP Server
     print("\n📍 Checking MCP Server...")
-    try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:8000/health", timeout=2)
-            if response.status_code == 200:
-                print("   ✅ MCP Server is running on port 8000")
-            else:
-                issues.append("MCP Server is not responding properly")
-    except Exception:
+    if mcp_ok:
+        print("   ✅ MCP Server is running on port 8000")
+    elif mcp_error is None:
+        issues.append("MCP Server is not responding properly")
+    else:
         print("   ⚠️  MCP Server is not running (optional for some tests)")
         print("      Start it with: python run_server.py")
 
@@ -83,37 +113,46 @@ async def check_prerequisites():
 
 
 async def run_test_module(module_name, description):
-    """Run a single test module."""
+    """Run a single test module in its own Python process."""
     print_section(description)
 
     start_time = time.time()
 
     try:
-        # Run the test module as a subprocess
-        result = subprocess.run(
-            [sys.executable, f"tests/{module_name}"],
-            capture_output=True,
-            text=True,
-            timeout=60  # 60 second timeout per test module
+        # Run the test module as a subprocess, without blocking the event loop
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, f"tests/{module_name}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(),
+                timeout=60  # 60 second timeout per test module
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
 
         # Print the output
-        print(result.stdout)
+        print(stdout.decode(errors="replace"))
 
-        if result.stderr and "ERROR" in result.stderr:
+        stderr = stderr.decode(errors="replace")
+        if stderr and "ERROR" in stderr:
             print("Errors detected:")
-            print(result.stderr)
+            print(stderr)
 
         elapsed = time.time() - start_time
 
-        if result.returncode == 0:
+        if process.returncode == 0:
             print(f"\n✅ {description} passed ({elapsed:.1f}s)")
             return True
         else:
             print(f"\n❌ {description} failed ({elapsed:.1f}s)")
             return False
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         print(f"\n❌ {description} timed out after 60 seconds")
         return False
     except Exception as e:
@@ -121,7 +160,7 @@ async def run_test_module(module_name, description):
         return False
 
 
-async def main():
+async def run_all_suites():
     """Run all integration tests."""
     print_header("HEPHAESTUS INTEGRATION TEST SUITE")
     print(f"\n📅 Test run started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -146,7 +185,6 @@ async def main():
     for module, description in test_modules:
         result = await run_test_module(module, description)
         results[description] = result
-        await asyncio.sleep(1)  # Brief pause between test suites
 
     # Print summary
     print_header("TEST SUMMARY")
@@ -172,7 +210,15 @@ async def main():
         return False
 
 
-def run_quick_test():
+async def main():
+    """Run all integration tests, closing the shared HTTP client afterwards."""
+    try:
+        return await run_all_suites()
+    finally:
+        await close_http_client()
+
+
+async def run_quick_test():
     """Run a quick smoke test."""
     print_header("QUICK SMOKE TEST")
 
@@ -192,15 +238,17 @@ def run_quick_test():
         print("   Testing connections...")
         config = Config()
 
-        # Initialize components (but don't make API calls)
-        vector_store = VectorStoreManager()
-        print("   ✅ Vector store initialized")
-
-        llm_provider = OpenAIProvider(
-            api_key=config.openai_api_key,
-            model=config.llm_model,
-            embedding_model=config.embedding_model
+        # Initialize components concurrently (but don't make API calls)
+        vector_store, llm_provider = await asyncio.gather(
+            asyncio.to_thread(VectorStoreManager),
+            asyncio.to_thread(
+                OpenAIProvider,
+                api_key=config.openai_api_key,
+                model=config.llm_model,
+                embedding_model=config.embedding_model
+            ),
         )
+        print("   ✅ Vector store initialized")
         print("   ✅ LLM provider initialized")
 
         print("\n✅ Smoke test passed! System appears to be configured correctly.")
@@ -222,7 +270,7 @@ if __name__ == "__main__":
 
     try:
         if args.quick:
-            success = run_quick_test()
+            success = asyncio.run(run_quick_test())
         elif args.module:
             # Run specific module
             print_header(f"Running {args.module}")
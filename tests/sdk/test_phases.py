@@ -1,13 +1,27 @@
 """Tests for phase loading functionality."""
 
 import pytest
-import tempfile
 import yaml
 from pathlib import Path
 
 from src.sdk.models import Phase
 from src.sdk.client import HephaestusSDK
 
+# Prefer libyaml's C dumper when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Field values shared by phases whose content doesn't matter to a test
+_PHASE_TEMPLATE = {
+    "description": "Test",
+    "done_definitions": ["Done"],
+    "working_directory": ".",
+}
+
+
+def make_phase(id: int, name: str, **overrides) -> Phase:
+    """Helper to create a Phase from the template, with optional field overrides."""
+    return Phase(id=id, name=name, **{**_PHASE_TEMPLATE, **overrides})
+
 
 def create_test_phase_yaml(path: Path, phase_id: int, name: str):
     """Helper to create a test phase YAML file."""
@@ -27,142 +41,85 @@ def create_test_phase_yaml(path: Path, phase_id: int, name: str):
     filepath = path / filename
 
     with open(filepath, "w") as f:
-        yaml.dump(data, f)
+        yaml.dump(data, f, Dumper=_YAML_DUMPER)
 
 
-def test_load_phases_from_yaml():
-    """Test loading phases from YAML directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmppath = Path(tmpdir)
+@pytest.fixture(autouse=True, scope="module")
+def _api_key():
+    """Set an API key for config validation once for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ANTHROPIC_API_KEY", "test-key")
+        yield
+
 
-        # Create test phase files
-        create_test_phase_yaml(tmppath, 1, "planning")
-        create_test_phase_yaml(tmppath, 2, "implementation")
-        create_test_phase_yaml(tmppath, 3, "validation")
+@pytest.fixture(scope="module")
+def phases_dir(tmp_path_factory):
+    """Directory holding three phase YAML files, written once per module."""
+    path = tmp_path_factory.mktemp("phases")
+    create_test_phase_yaml(path, 1, "planning")
+    create_test_phase_yaml(path, 2, "implementation")
+    create_test_phase_yaml(path, 3, "validation")
+    return path
 
-        # Set API key for config validation
-        import os
 
-        os.environ["ANTHROPIC_API_KEY"] = "test-key"
+@pytest.fixture(scope="module")
+def sdk_from_dir(phases_dir):
+    """SDK loaded from the phases directory, built once per module."""
+    return HephaestusSDK(phases_dir=str(phases_dir))
 
-        try:
-            # Load SDK with phases directory
-            sdk = HephaestusSDK(phases_dir=str(tmppath))
 
-            # Check phases loaded correctly
-            assert len(sdk.phases_map) == 3
-            assert 1 in sdk.phases_map
-            assert 2 in sdk.phases_map
-            assert 3 in sdk.phases_map
+@pytest.fixture(scope="module")
+def sdk_from_objs():
+    """SDK loaded from Python phase objects, built once per module."""
+    phases = [
+        make_phase(1, "planning", description="Plan the work"),
+        make_phase(2, "implementation", description="Implement the work"),
+    ]
+    return HephaestusSDK(phases=phases)
 
-            # Check phase 1
-            phase1 = sdk.phases_map[1]
-            assert phase1.name == "planning"
-            assert phase1.description == "Phase 1 description"
-            assert len(phase1.done_definitions) == 2
 
-        finally:
-            del os.environ["ANTHROPIC_API_KEY"]
+def test_load_phases_from_yaml(sdk_from_dir):
+    """Test loading phases from YAML directory."""
+    # Check phases loaded correctly
+    assert len(sdk_from_dir.phases_map) == 3
+    assert 1 in sdk_from_dir.phases_map
+    assert 2 in sdk_from_dir.phases_map
+    assert 3 in sdk_from_dir.phases_map
+
+    # Check phase 1
+    phase1 = sdk_from_dir.phases_map[1]
+    assert phase1.name == "planning"
+    assert phase1.description == "Phase 1 description"
+    assert len(phase1.done_definitions) == 2
 
 
-def test_load_phases_from_python_objects():
+def test_load_phases_from_python_objects(sdk_from_objs):
     """Test loading phases from Python objects."""
-    import os
-
-    os.environ["ANTHROPIC_API_KEY"] = "test-key"
-
-    try:
-        phases = [
-            Phase(
-                id=1,
-                name="planning",
-                description="Plan the work",
-                done_definitions=["Plan created"],
-                working_directory="/test",
-            ),
-            Phase(
-                id=2,
-                name="implementation",
-                description="Implement the work",
-                done_definitions=["Code written"],
-                working_directory="/test",
-            ),
-        ]
-
-        sdk = HephaestusSDK(phases=phases)
-
-        assert len(sdk.phases_map) == 2
-        assert sdk.phases_map[1].name == "planning"
-        assert sdk.phases_map[2].name == "implementation"
-
-    finally:
-        del os.environ["ANTHROPIC_API_KEY"]
+    assert len(sdk_from_objs.phases_map) == 2
+    assert sdk_from_objs.phases_map[1].name == "planning"
+    assert sdk_from_objs.phases_map[2].name == "implementation"
 
 
 def test_cannot_provide_both_phases_dir_and_phases():
     """Test that providing both phases_dir and phases raises error."""
-    import os
+    phases = [make_phase(1, "test")]
 
-    os.environ["ANTHROPIC_API_KEY"] = "test-key"
-
-    try:
-        phases = [
-            Phase(
-                id=1,
-                name="test",
-                description="Test",
-                done_definitions=["Done"],
-                working_directory=".",
-            )
-        ]
-
-        with pytest.raises(ValueError, match="Cannot provide both"):
-            HephaestusSDK(phases_dir="/some/path", phases=phases)
-
-    finally:
-        del os.environ["ANTHROPIC_API_KEY"]
+    with pytest.raises(ValueError, match="Cannot provide both"):
+        HephaestusSDK(phases_dir="/some/path", phases=phases)
 
 
 def test_must_provide_either_phases_dir_or_phases():
     """Test that at least one of phases_dir or phases must be provided."""
-    import os
-
-    os.environ["ANTHROPIC_API_KEY"] = "test-key"
-
-    try:
-        with pytest.raises(ValueError, match="Either phases_dir or phases must be provided"):
-            HephaestusSDK()
-
-    finally:
-        del os.environ["ANTHROPIC_API_KEY"]
+    with pytest.raises(ValueError, match="Either workflow_definitions, phases_dir, or phases must be provided"):
+        HephaestusSDK()
 
 
 def test_duplicate_phase_ids_rejected():
     """Test that duplicate phase IDs are rejected."""
-    import os
-
-    os.environ["ANTHROPIC_API_KEY"] = "test-key"
-
-    try:
-        phases = [
-            Phase(
-                id=1,
-                name="first",
-                description="First",
-                done_definitions=["Done"],
-                working_directory=".",
-            ),
-            Phase(
-                id=1,  # Duplicate ID
-                name="second",
-                description="Second",
-                done_definitions=["Done"],
-                working_directory=".",
-            ),
-        ]
-
-        with pytest.raises(ValueError, match="Duplicate phase ID"):
-            HephaestusSDK(phases=phases)
-
-    finally:
-        del os.environ["ANTHROPIC_API_KEY"]
+    phases = [
+        make_phase(1, "first"),
+        make_phase(1, "second"),  # Duplicate ID
+    ]
+
+    with pytest.raises(ValueError, match="Duplicate phase ID"):
+        HephaestusSDK(phases=phases)
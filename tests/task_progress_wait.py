@@ -0,0 +1,76 @@
+"""Shared helper for integration tests that wait on the MCP server's task processor."""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# fetch(path, params, timeout) performs a GET against the MCP server with the
+# caller's own client and returns (status code, content type, raw body)
+Fetch = Callable[[str, Dict[str, str], float], Awaitable[Tuple[int, str, bytes]]]
+
+
+def json_object(content_type: str, body: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a JSON object body, returning None for any other kind of body."""
+    if not content_type.startswith("application/json"):
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def route_missing(status: int, content_type: str, body: bytes) -> bool:
+    """Whether a response is an unknown-route 404 rather than an unknown task.
+
+    FastAPI answers unknown routes with its default "Not Found" detail, while
+    the task endpoints say "Task not found".
+    """
+    if status != 404:
+        return False
+    data = json_object(content_type, body)
+    return data is not None and data.get("detail") == "Not Found"
+
+
+def _left_pending(task: Dict[str, Any]) -> bool:
+    return task.get("status") != "pending" or bool(task.get("assigned_agent_id"))
+
+
+async def wait_for_task_assignment(
+    fetch: Fetch,
+    task_id: str,
+    timeout: float,
+    interval: float = 0.05,
+    max_interval: float = 0.25,
+) -> Optional[Dict[str, Any]]:
+    """Wait up to ``timeout`` seconds for a new task to leave ``pending``.
+
+    Long-polls ``/task_progress/{task_id}/await_assignment``, falling back to
+    polling ``/task_progress?task_id=...`` with backoff on servers without that
+    route. Returns the task payload once the task has left ``pending``, or
+    None if it has not done so in time.
+    """
+    status, content_type, body = await fetch(
+        f"/task_progress/{task_id}/await_assignment",
+        {"timeout": str(timeout)},
+        timeout + 5.0,
+    )
+    if status == 200:
+        task = json_object(content_type, body)
+        return task if task is not None and _left_pending(task) else None
+    if not route_missing(status, content_type, body):
+        return None
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, content_type, body = await fetch(
+            "/task_progress", {"task_id": task_id}, timeout
+        )
+        if status == 200:
+            task = json_object(content_type, body)
+            if task is not None and _left_pending(task):
+                return task
+        await asyncio.sleep(interval)
+        interval = min(interval * 1.5, max_interval)
+    return None
@@ -6,8 +6,29 @@ import os
 import asyncio
 from datetime import datetime
 import httpx
+import orjson
 import uuid
 
+from tests.task_progress_wait import wait_for_task_assignment
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share one event loop so the class-scoped HTTP client outlives each test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def server_up():
+    """Probe the MCP server's /health endpoint once per test session."""
+    try:
+        response = httpx.get(f"{TestReportResultsEndpointAsync.BASE_URL}/health", timeout=1.0)
+        return response.status_code == 200
+    except httpx.HTTPError:
+        return False
+
 
 @pytest.mark.asyncio
 class TestReportResultsEndpointAsync:
@@ -15,11 +36,21 @@ class TestReportResultsEndpointAsync:
 
     BASE_URL = "http://localhost:8000"
 
+    @pytest.fixture(scope="class")
+    async def client(self):
+        """Keep-alive HTTP client shared by every test in the class."""
+        async with httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=10),
+        ) as client:
+            yield client
+
     @pytest.fixture
     def valid_markdown_file(self):
         """Create a valid markdown file for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write("# Test Results\n\nThis is a test result.")
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.md', delete=False) as f:
+            f.write(b"# Test Results\n\nThis is a test result.")
             temp_path = f.name
         yield temp_path
         os.unlink(temp_path)
@@ -27,23 +58,39 @@ class TestReportResultsEndpointAsync:
     @pytest.fixture
     def large_markdown_file(self):
         """Create a large markdown file for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.md', delete=False) as f:
             # Write 101KB of data
-            f.write("# Large File\n" + "x" * (101 * 1024))
+            f.write(b"# Large File\n")
+            f.write(b"x" * (101 * 1024))
             temp_path = f.name
         yield temp_path
         os.unlink(temp_path)
 
     async def create_test_task(self):
         """Helper to create a task for testing."""
-        async with httpx.AsyncClient() as client:
-            # Create a task
-            task_id = str(uuid.uuid4())
-            agent_id = f"test-agent-{uuid.uuid4()}"
+        # Create a task
+        task_id = str(uuid.uuid4())
+        agent_id = f"test-agent-{uuid.uuid4()}"
 
-            # First create task via API (simulated)
-            # For testing, we'll just return mock IDs
-            return task_id, agent_id
+        # First create task via API (simulated)
+        # For testing, we'll just return mock IDs
+        return task_id, agent_id
+
+    async def wait_for_assignment(self, client, task_id, timeout=3.0):
+        """Wait up to ``timeout`` seconds for the server to pick up a task."""
+        headers = {"X-Agent-ID": "test-agent-results"}
+
+        async def fetch(path, params, request_timeout):
+            response = await client.get(
+                path, params=params, headers=headers, timeout=request_timeout
+            )
+            return (
+                response.status_code,
+                response.headers.get("content-type", ""),
+                response.content,
+            )
+
+        await wait_for_task_assignment(fetch, task_id, timeout)
 
     async def test_report_results_with_mock(self, valid_markdown_file):
         """Test successful result reporting with mocked service."""
@@ -130,82 +177,79 @@ class TestReportResultsEndpointAsync:
         validate_markdown_format("/path/to/file.md")  # Should not raise
 
         # Test file size validation
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md') as f:
-            f.write("Small content")
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.md') as f:
+            f.write(b"Small content")
             f.flush()
             validate_file_size(f.name, max_size_kb=100)  # Should not raise
 
-            # Write large content
+            # Replace with large content
             f.seek(0)
-            f.write("x" * (2 * 1024))  # 2KB
+            f.truncate()
+            f.write(b"x" * (2 * 1024))  # 2KB
             f.flush()
 
             with pytest.raises(ValueError, match="File too large"):
                 validate_file_size(f.name, max_size_kb=1)
 
-    async def test_integration_with_server(self):
+    async def test_integration_with_server(self, server_up, client):
         """Test integration with running server."""
-        async with httpx.AsyncClient() as client:
-            # Check server health first
-            response = await client.get(f"{self.BASE_URL}/health")
-
-            if response.status_code != 200:
-                pytest.skip("Server not running")
-
-            # Create a test task
-            task_payload = {
-                "task_description": "Test task for result reporting",
-                "done_definition": "Task completed",
-                "ai_agent_id": "test-agent-results",
-                "priority": "medium"
-            }
+        if not server_up:
+            pytest.skip("Server not running")
+
+        # Create a test task
+        task_payload = {
+            "task_description": "Test task for result reporting",
+            "done_definition": "Task completed",
+            "ai_agent_id": "test-agent-results",
+            "priority": "medium"
+        }
 
-            response = await client.post(
-                f"{self.BASE_URL}/create_task",
-                json=task_payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Agent-ID": "test-agent-results"
-                }
-            )
+        response = await client.post(
+            "/create_task",
+            content=orjson.dumps(task_payload),
+            headers={
+                "Content-Type": "application/json",
+                "X-Agent-ID": "test-agent-results"
+            }
+        )
 
-            if response.status_code == 200:
-                task_data = response.json()
-                task_id = task_data.get("task_id")
-
-                # Wait for task assignment
-                await asyncio.sleep(3)
-
-                # Create result file
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-                    f.write("# Test Results\n\nIntegration test results.")
-                    result_file = f.name
-
-                try:
-                    # Try to report results (may fail if task not assigned yet)
-                    result_response = await client.post(
-                        f"{self.BASE_URL}/report_results",
-                        json={
-                            "task_id": task_id,
-                            "markdown_file_path": result_file,
-                            "result_type": "test",
-                            "summary": "Integration test"
-                        },
-                        headers={
-                            "Content-Type": "application/json",
-                            "X-Agent-ID": "test-agent-results"
-                        }
-                    )
-
-                    # If task is not assigned, that's expected
-                    if result_response.status_code == 400:
-                        assert "not assigned" in result_response.json().get("detail", "")
-                    else:
-                        # If successful, verify response
-                        assert result_response.status_code == 200
-                        result_data = result_response.json()
-                        assert result_data["status"] == "stored"
-                        assert "result_id" in result_data
-
-                finally:
-                    os.unlink(result_file)
\ No newline at end of file
+        if response.status_code == 200:
+            task_data = orjson.loads(response.content)
+            task_id = task_data.get("task_id")
+
+            # Wait for task assignment
+            await self.wait_for_assignment(client, task_id)
+
+            # Create result file
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
+                f.write("# Test Results\n\nIntegration test results.")
+                result_file = f.name
+
+            try:
+                # Try to report results (may fail if task not assigned yet)
+                result_response = await client.post(
+                    "/report_results",
+                    content=orjson.dumps({
+                        "task_id": task_id,
+                        "markdown_file_path": result_file,
+                        "result_type": "test",
+                        "summary": "Integration test"
+                    }),
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Agent-ID": "test-agent-results"
+                    }
+                )
+
+                # If task is not assigned, that's expected
+                if result_response.status_code == 400:
+                    assert "not assigned" in orjson.loads(result_response.content).get("detail", "")
+                else:
+                    # If successful, verify response
+                    assert result_response.status_code == 200
+                    result_data = orjson.loads(result_response.content)
+                    assert result_data["status"] == "stored"
+                    assert "result_id" in result_data
+
+            finally:
+                os.unlink(result_file)
\ No newline at end of file
@@ -8,118 +8,179 @@ import json
 import sys
 import os
 import time
+
+import pytest
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from tests.task_progress_wait import wait_for_task_assignment
+
 
 BASE_URL = "http://localhost:8000"
 TEST_AGENT_ID = f"test-agent-{uuid.uuid4()}"
 
+# Created lazily by get_session() and shared by every endpoint test
+_session = None
+
+
+def get_session():
+    """Return the shared keep-alive session used by the endpoint tests."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session, if one was created."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share one event loop so the session outlives each test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module", autouse=True)
+async def _shared_session():
+    """Close the shared session once this module's tests are done."""
+    yield
+    await close_session()
+
 
 async def test_health_endpoint():
     """Test the health check endpoint."""
     print("\n🧪 Testing Health Endpoint...")
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(f"{BASE_URL}/health") as response:
-                assert response.status == 200, f"Expected 200, got {response.status}"
-                data = await response.json()
+    session = get_session()
+    try:
+        async with session.get(f"{BASE_URL}/health") as response:
+            assert response.status == 200, f"Expected 200, got {response.status}"
+            data = await response.json()
 
-                print(f"   Status: {data.get('status')}")
-                print(f"   Uptime: {data.get('uptime_seconds', 0):.1f} seconds")
-                print(f"   Active agents: {data.get('active_agents', 0)}")
-                print(f"   ✅ Health check passed")
+            print(f"   Status: {data.get('status')}")
+            print(f"   Uptime: {data.get('uptime_seconds', 0):.1f} seconds")
+            print(f"   Active agents: {data.get('active_agents', 0)}")
+            print(f"   ✅ Health check passed")
 
-                return True
+            return True
 
-        except Exception as e:
-            print(f"   ❌ Health check failed: {e}")
-            return False
+    except Exception as e:
+        print(f"   ❌ Health check failed: {e}")
+        return False
 
 
 async def test_create_task():
     """Test task creation endpoint."""
     print("\n🧪 Testing Task Creation...")
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Create a test task
-            task_data = {
-                "task_description": "Write unit tests for the authentication module",
-                "done_definition": "All auth functions have >90% test coverage with passing tests",
-                "priority": "medium"
-            }
-
-            headers = {
-                "Content-Type": "application/json",
-                "X-Agent-ID": TEST_AGENT_ID
-            }
-
-            async with session.post(
-                f"{BASE_URL}/create_task",
-                json=task_data,
-                headers=headers
-            ) as response:
-                assert response.status == 200, f"Expected 200, got {response.status}"
-                data = await response.json()
-
-                task_id = data.get("task_id")
-                assert task_id, "No task_id in response"
-
-                print(f"   Task ID: {task_id}")
-                print(f"   Status: {data.get('status')}")
-                print(f"   Enriched: {data.get('enriched_description', '')[:80]}...")
-                print(f"   ✅ Task created successfully")
-
-                return task_id
+    session = get_session()
+    try:
+        # Create a test task
+        task_data = {
+            "task_description": "Write unit tests for the authentication module",
+            "done_definition": "All auth functions have >90% test coverage with passing tests",
+            "priority": "medium"
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "X-Agent-ID": TEST_AGENT_ID
+        }
+
+        async with session.post(
+            f"{BASE_URL}/create_task",
+            json=task_data,
+            headers=headers
+        ) as response:
+            assert response.status == 200, f"Expected 200, got {response.status}"
+            data = await response.json()
+
+            task_id = data.get("task_id")
+            assert task_id, "No task_id in response"
+
+            print(f"   Task ID: {task_id}")
+            print(f"   Status: {data.get('status')}")
+            print(f"   Enriched: {data.get('enriched_description', '')[:80]}...")
+            print(f"   ✅ Task created successfully")
+
+            return task_id
 
-        except Exception as e:
-            print(f"   ❌ Task creation failed: {e}")
-            return None
+    except Exception as e:
+        print(f"   ❌ Task creation failed: {e}")
+        return None
 
 
 async def test_save_memory():
     """Test memory saving endpoint."""
     print("\n🧪 Testing Memory Saving...")
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            memory_data = {
-                "memory_content": "Always validate user input on both client and server side to prevent XSS attacks",
-                "memory_type": "learning",
-                "tags": ["security", "validation", "xss"],
-                "related_files": ["src/validators.js", "src/middleware/auth.js"]
-            }
-
-            headers = {
-                "Content-Type": "application/json",
-                "X-Agent-ID": TEST_AGENT_ID
-            }
-
-            async with session.post(
-                f"{BASE_URL}/save_memory",
-                json=memory_data,
-                headers=headers
-            ) as response:
-                assert response.status == 200, f"Expected 200, got {response.status}"
-                data = await response.json()
+    session = get_session()
+    try:
+        memory_data = {
+            "memory_content": "Always validate user input on both client and server side to prevent XSS attacks",
+            "memory_type": "learning",
+            "tags": ["security", "validation", "xss"],
+            "related_files": ["src/validators.js", "src/middleware/auth.js"]
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "X-Agent-ID": TEST_AGENT_ID
+        }
+
+        async with session.post(
+            f"{BASE_URL}/save_memory",
+            json=memory_data,
+            headers=headers
+        ) as response:
+            assert response.status == 200, f"Expected 200, got {response.status}"
+            data = await response.json()
+
+            memory_id = data.get("memory_id")
+            assert memory_id, "No memory_id in response"
+
+            print(f"   Memory ID: {memory_id}")
+            print(f"   Stored: {data.get('stored', False)}")
+            print(f"   Duplicate: {data.get('duplicate', False)}")
+
+            if data.get("similar_memories"):
+                print(f"   Found {len(data['similar_memories'])} similar memories")
+
+            print(f"   ✅ Memory saved successfully")
+            return memory_id
+
+    except Exception as e:
+        print(f"   ❌ Memory saving failed: {e}")
+        return None
 
-                memory_id = data.get("memory_id")
-                assert memory_id, "No memory_id in response"
 
-                print(f"   Memory ID: {memory_id}")
-                print(f"   Stored: {data.get('stored', False)}")
-                print(f"   Duplicate: {data.get('duplicate', False)}")
+async def wait_for_task_ready(session, task_id, timeout=2.0):
+    """Wait up to ``timeout`` seconds for a new task to leave ``pending``.
 
-                if data.get("similar_memories"):
-                    print(f"   Found {len(data['similar_memories'])} similar memories")
+    Returns whether the task left ``pending`` in time.
+    """
+    headers = {"X-Agent-ID": TEST_AGENT_ID}
 
-                print(f"   ✅ Memory saved successfully")
-                return memory_id
+    async def fetch(path, params, request_timeout):
+        async with session.get(
+            f"{BASE_URL}{path}",
+            params=params,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=request_timeout),
+        ) as response:
+            return response.status, response.content_type, await response.read()
 
-        except Exception as e:
-            print(f"   ❌ Memory saving failed: {e}")
-            return None
+    return await wait_for_task_assignment(fetch, task_id, timeout) is not None
 
 
 async def test_task_status_update():
@@ -132,109 +193,109 @@ async def test_task_status_update():
         print("   ⚠️  Skipping status update test (no task created)")
         return False
 
-    await asyncio.sleep(2)  # Wait for task to be processed
-
-    async with aiohttp.ClientSession() as session:
-        try:
-            update_data = {
-                "task_id": task_id,
-                "status": "done",
-                "summary": "Successfully wrote comprehensive unit tests for auth module",
-                "key_learnings": [
-                    "Use mock JWT tokens for testing authentication",
-                    "Test both success and failure cases for each endpoint",
-                    "Include edge cases like expired tokens and malformed requests"
-                ],
-                "code_changes": ["tests/auth.test.js", "tests/fixtures/tokens.js"]
-            }
-
-            headers = {
-                "Content-Type": "application/json",
-                "X-Agent-ID": TEST_AGENT_ID  # Must match the agent that created the task
-            }
-
-            async with session.post(
-                f"{BASE_URL}/update_task_status",
-                json=update_data,
-                headers=headers
-            ) as response:
-                # Note: This might fail if the task wasn't assigned to our test agent
-                if response.status == 403:
-                    print(f"   ⚠️  Task not assigned to test agent (expected behavior)")
-                    return True
-
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"   Task marked as: {update_data['status']}")
-                    print(f"   Memories saved: {data.get('memories_saved', 0)}")
-                    print(f"   ✅ Task status updated successfully")
-                    return True
-                else:
-                    text = await response.text()
-                    print(f"   ⚠️  Status update returned {response.status}: {text}")
-                    return False
-
-        except Exception as e:
-            print(f"   ❌ Task status update failed: {e}")
-            return False
+    session = get_session()
+    try:
+        await wait_for_task_ready(session, task_id)  # Wait for task to be processed
+
+        update_data = {
+            "task_id": task_id,
+            "status": "done",
+            "summary": "Successfully wrote comprehensive unit tests for auth module",
+            "key_learnings": [
+                "Use mock JWT tokens for testing authentication",
+                "Test both success and failure cases for each endpoint",
+                "Include edge cases like expired tokens and malformed requests"
+            ],
+            "code_changes": ["tests/auth.test.js", "tests/fixtures/tokens.js"]
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "X-Agent-ID": TEST_AGENT_ID  # Must match the agent that created the task
+        }
+
+        async with session.post(
+            f"{BASE_URL}/update_task_status",
+            json=update_data,
+            headers=headers
+        ) as response:
+            # Note: This might fail if the task wasn't assigned to our test agent
+            if response.status == 403:
+                print(f"   ⚠️  Task not assigned to test agent (expected behavior)")
+                return True
+
+            if response.status == 200:
+                data = await response.json()
+                print(f"   Task marked as: {update_data['status']}")
+                print(f"   Memories saved: {data.get('memories_saved', 0)}")
+                print(f"   ✅ Task status updated successfully")
+                return True
+            else:
+                text = await response.text()
+                print(f"   ⚠️  Status update returned {response.status}: {text}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Task status update failed: {e}")
+        return False
 
 
 async def test_agent_status():
     """Test agent status endpoint."""
     print("\n🧪 Testing Agent Status...")
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(f"{BASE_URL}/agent_status") as response:
-                assert response.status == 200, f"Expected 200, got {response.status}"
-                data = await response.json()
+    session = get_session()
+    try:
+        async with session.get(f"{BASE_URL}/agent_status") as response:
+            assert response.status == 200, f"Expected 200, got {response.status}"
+            data = await response.json()
 
-                agents = data.get("agents", [])
-                print(f"   Active agents: {len(agents)}")
+            agents = data.get("agents", [])
+            print(f"   Active agents: {len(agents)}")
 
-                for agent in agents[:3]:  # Show first 3 agents
-                    print(f"      - Agent {agent.get('id', 'unknown')[:8]}...")
-                    print(f"        Status: {agent.get('status')}")
-                    print(f"        Task: {agent.get('current_task', {}).get('description', 'None')[:50]}...")
+            for agent in agents[:3]:  # Show first 3 agents
+                print(f"      - Agent {agent.get('id', 'unknown')[:8]}...")
+                print(f"        Status: {agent.get('status')}")
+                print(f"        Task: {agent.get('current_task', {}).get('description', 'None')[:50]}...")
 
-                print(f"   ✅ Agent status retrieved successfully")
-                return True
+            print(f"   ✅ Agent status retrieved successfully")
+            return True
 
-        except Exception as e:
-            print(f"   ❌ Agent status failed: {e}")
-            return False
+    except Exception as e:
+        print(f"   ❌ Agent status failed: {e}")
+        return False
 
 
 async def test_task_progress():
     """Test task progress endpoint."""
     print("\n🧪 Testing Task Progress...")
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(f"{BASE_URL}/task_progress") as response:
-                assert response.status == 200, f"Expected 200, got {response.status}"
-                data = await response.json()
-
-                tasks = data.get("tasks", {})
-                print(f"   Task summary:")
-                print(f"      Pending: {tasks.get('pending', 0)}")
-                print(f"      Assigned: {tasks.get('assigned', 0)}")
-                print(f"      In Progress: {tasks.get('in_progress', 0)}")
-                print(f"      Completed: {tasks.get('completed', 0)}")
-                print(f"      Failed: {tasks.get('failed', 0)}")
-
-                recent = data.get("recent_tasks", [])
-                if recent:
-                    print(f"   Recent tasks:")
-                    for task in recent[:3]:
-                        print(f"      - [{task.get('status')}] {task.get('description', '')[:50]}...")
-
-                print(f"   ✅ Task progress retrieved successfully")
-                return True
+    session = get_session()
+    try:
+        async with session.get(f"{BASE_URL}/task_progress") as response:
+            assert response.status == 200, f"Expected 200, got {response.status}"
+            data = await response.json()
+
+            tasks = data.get("tasks", {})
+            print(f"   Task summary:")
+            print(f"      Pending: {tasks.get('pending', 0)}")
+            print(f"      Assigned: {tasks.get('assigned', 0)}")
+            print(f"      In Progress: {tasks.get('in_progress', 0)}")
+            print(f"      Completed: {tasks.get('completed', 0)}")
+            print(f"      Failed: {tasks.get('failed', 0)}")
+
+            recent = data.get("recent_tasks", [])
+            if recent:
+                print(f"   Recent tasks:")
+                for task in recent[:3]:
+                    print(f"      - [{task.get('status')}] {task.get('description', '')[:50]}...")
+
+            print(f"   ✅ Task progress retrieved successfully")
+            return True
 
-        except Exception as e:
-            print(f"   ❌ Task progress failed: {e}")
-            return False
+    except Exception as e:
+        print(f"   ❌ Task progress failed: {e}")
+        return False
 
 
 async def test_sse_connection():
@@ -283,29 +344,29 @@ async def run_all_tests():
     print("MCP SERVER INTEGRATION TESTS")
     print("=" * 60)
 
-    # Check if server is running
-    print("\nChecking if MCP server is running...")
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{BASE_URL}/health", timeout=2) as response:
-                if response.status != 200:
-                    print("❌ MCP server is not responding properly")
-                    print("Please start the server with: python run_server.py")
-                    return False
-    except Exception as e:
-        print(f"❌ Cannot connect to MCP server at {BASE_URL}")
+        return await _run_all_tests()
+    finally:
+        await close_session()
+
+
+async def _run_all_tests():
+    """Check the server is up via the health test, then run the rest."""
+    # The health test doubles as the check that the server is running
+    if not await test_health_endpoint():
+        print(f"\n❌ Cannot connect to MCP server at {BASE_URL}")
         print("Please start the server with: python run_server.py")
         return False
 
-    print("✅ Server is running\n")
-
-    # Run tests
-    results = []
-    results.append(await test_health_endpoint())
-    results.append(await test_save_memory())
-    results.append(await test_agent_status())
-    results.append(await test_task_progress())
-    results.append(await test_sse_connection())
+    # Run the independent tests concurrently
+    results = await asyncio.gather(
+        test_save_memory(),
+        test_agent_status(),
+        test_task_progress(),
+        test_sse_connection(),
+        return_exceptions=True,
+    )
+    results = [False if isinstance(result, BaseException) else result for result in results]
 
     # Task creation and update tests might fail due to agent assignment
     # but we still run them to test the endpoints
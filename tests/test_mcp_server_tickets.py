@@ -42,20 +42,21 @@ def setup_test_database():
         del os.environ["HEPHAESTUS_TEST_DB"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(setup_test_database):
-    """Create FastAPI test client."""
+    """Create FastAPI test client shared by the module's tests."""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def headers():
     """Default headers for requests."""
     return {"X-Agent-ID": "agent-e2e-test"}
 
 
+@pytest.mark.xdist_group("ticket_write_chain")
 class TestMCPTicketEndpoints:
-    """Test all 11 ticket endpoints via MCP server."""
+    """Test the ticket endpoints that create and modify ticket_id_1, in order."""
 
     def test_01_create_ticket(self, client, headers):
         """Test POST /tickets/create - Create a new ticket."""
@@ -176,25 +177,6 @@ class TestMCPTicketEndpoints:
         assert data["new_status"] == "todo"
         print(f"✅ Changed status: {data['old_status']} → {data['new_status']}")
 
-    def test_07_search_tickets(self, client, headers):
-        """Test POST /tickets/search - Search tickets."""
-        response = client.post(
-            "/tickets/search",
-            headers=headers,
-            json={
-                "workflow_id": "workflow-e2e-test",
-                "query": "authentication",  # Search for tickets from e2e test
-                "search_mode": "keyword",
-            }
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        # The search response has "results" not "tickets"
-        assert "results" in data or "tickets" in data
-        results = data.get("results") or data.get("tickets", [])
-        print(f"✅ Search found {len(results)} tickets")
-
     def test_08_link_commit(self, client, headers):
         """Test POST /tickets/link-commit - Link commit to ticket."""
         if not hasattr(TestMCPTicketEndpoints, 'ticket_id_1'):
@@ -217,23 +199,6 @@ class TestMCPTicketEndpoints:
         assert data["commit_sha"] == "mcp123abc456"
         print(f"✅ Linked commit: {data['commit_sha']}")
 
-    def test_09_get_ticket_stats(self, client, headers):
-        """Test GET /tickets/stats/{workflow_id} - Get ticket statistics."""
-        response = client.get(
-            "/tickets/stats/workflow-e2e-test",
-            headers=headers,
-        )
-
-        if response.status_code == 500:
-            print(f"⚠️  Stats endpoint returned 500 (may need implementation fixes)")
-            pytest.skip("Stats endpoint error - needs investigation")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert "total_tickets" in data
-        assert data["total_tickets"] >= 1
-        print(f"✅ Ticket stats: {data['total_tickets']} total tickets")
-
     def test_10_resolve_ticket(self, client, headers):
         """Test POST /tickets/resolve - Resolve a ticket."""
         if not hasattr(TestMCPTicketEndpoints, 'ticket_id_1'):
@@ -277,6 +242,51 @@ class TestMCPTicketEndpoints:
         assert data["is_resolved"] is True
         print(f"✅ Resolved ticket: {TestMCPTicketEndpoints.ticket_id_1}")
 
+
+@pytest.mark.xdist_group("ticket_readonly")
+class TestMCPTicketReadOnly:
+    """Test the read-only ticket endpoints, which don't depend on ticket_id_1.
+
+    With ``pytest -n auto --dist loadgroup`` these run on a separate worker,
+    concurrently with the write chain above.
+    """
+
+    def test_07_search_tickets(self, client, headers):
+        """Test POST /tickets/search - Search tickets."""
+        response = client.post(
+            "/tickets/search",
+            headers=headers,
+            json={
+                "workflow_id": "workflow-e2e-test",
+                "query": "authentication",  # Search for tickets from e2e test
+                "search_mode": "keyword",
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        # The search response has "results" not "tickets"
+        assert "results" in data or "tickets" in data
+        results = data.get("results") or data.get("tickets", [])
+        print(f"✅ Search found {len(results)} tickets")
+
+    def test_09_get_ticket_stats(self, client, headers):
+        """Test GET /tickets/stats/{workflow_id} - Get ticket statistics."""
+        response = client.get(
+            "/tickets/stats/workflow-e2e-test",
+            headers=headers,
+        )
+
+        if response.status_code == 500:
+            print(f"⚠️  Stats endpoint returned 500 (may need implementation fixes)")
+            pytest.skip("Stats endpoint error - needs investigation")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "total_tickets" in data
+        assert data["total_tickets"] >= 1
+        print(f"✅ Ticket stats: {data['total_tickets']} total tickets")
+
     def test_11_get_commit_diff(self, client, headers):
         """Test GET /tickets/commit-diff/{commit_sha} - Get commit diff."""
         response = client.get(
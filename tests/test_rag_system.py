@@ -271,24 +271,25 @@ Invalidates the refresh token.
     return True
 
 
-if __name__ == "__main__":
+async def run_all_tests():
+    """Run all RAG system tests."""
     print("=" * 60)
     print("RAG SYSTEM INTEGRATION TESTS")
     print("=" * 60)
 
-    async def run_all_tests():
-        """Run all RAG system tests."""
-        success = True
+    success = True
 
-        try:
-            success = await test_rag_retrieval() and success
-            success = await test_memory_ingestion() and success
-        except Exception as e:
-            print(f"\n❌ Tests failed: {e}")
-            return False
+    try:
+        success = await test_rag_retrieval() and success
+        success = await test_memory_ingestion() and success
+    except Exception as e:
+        print(f"\n❌ Tests failed: {e}")
+        return False
 
-        return success
+    return success
 
+
+if __name__ == "__main__":
     try:
         success = asyncio.run(run_all_tests())
         if not success:
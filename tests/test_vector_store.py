@@ -200,13 +200,18 @@ async def test_vector_store_operations():
     return True
 
 
-if __name__ == "__main__":
+async def run_all_tests():
+    """Run all vector store tests."""
     print("=" * 60)
     print("VECTOR STORE INTEGRATION TESTS")
     print("=" * 60)
 
+    return await test_vector_store_operations()
+
+
+if __name__ == "__main__":
     try:
-        asyncio.run(test_vector_store_operations())
+        asyncio.run(run_all_tests())
     except Exception as e:
         print(f"\n❌ Tests failed: {e}")
         sys.exit(1)
\ No newline at end of file